@@ -0,0 +1,291 @@
+"""
+Normalization Lambda function tests
+Tests claim field extraction, CSV parsing, ranged S3 downloads and Textract polling
+"""
+
+import io
+import os
+import sys
+
+import pytest
+from botocore.exceptions import ClientError
+
+# The module reads its configuration at import time
+os.environ.setdefault('ENVIRONMENT', 'test')
+os.environ.setdefault('CLAIMS_BUCKET_NAME', 'test-claims-bucket')
+os.environ.setdefault('AURORA_CLUSTER_ARN', 'arn:aws:rds:us-east-1:123456789012:cluster:test')
+os.environ.setdefault('AURORA_SECRET_ARN', 'arn:aws:secretsmanager:us-east-1:123456789012:secret:test')
+os.environ.setdefault('AGENT_LOGS_TABLE', 'test-agent-logs')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lambda_function  # noqa: E402
+
+
+def client_error(code, operation='GetObject'):
+    return ClientError({'Error': {'Code': code, 'Message': code}}, operation)
+
+
+class FakeS3Client:
+    """Serves ranged GETs of an in-memory object."""
+
+    def __init__(self, data, short_read_at=None):
+        self.data = data
+        self.short_read_at = short_read_at
+        self.calls = []
+
+    def get_object(self, Bucket, Key, Range, IfMatch=None):
+        self.calls.append({'Range': Range, 'IfMatch': IfMatch})
+        if not self.data:
+            raise client_error('InvalidRange')
+
+        start, end = (int(part) for part in Range[len('bytes='):].split('-'))
+        end = min(end, len(self.data) - 1)
+        body = self.data[start:end + 1]
+        if start == self.short_read_at:
+            body = body[:-1]
+
+        return {
+            'Body': io.BytesIO(body),
+            'ContentRange': f'bytes {start}-{end}/{len(self.data)}',
+            'ETag': '"test-etag"'
+        }
+
+
+class FakeTextractClient:
+    """Returns queued GetDocumentTextDetection responses in order."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.get_calls = []
+
+    def start_document_text_detection(self, DocumentLocation):
+        return {'JobId': 'job-1'}
+
+    def get_document_text_detection(self, **kwargs):
+        self.get_calls.append(kwargs)
+        return self.responses.pop(0)
+
+
+class FakeContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+def line_block(text):
+    return {'BlockType': 'LINE', 'Text': text, 'Confidence': 99.0}
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(lambda_function.time, 'sleep', recorded.append)
+    return recorded
+
+
+# parse_claim_lines
+
+def test_parse_claim_lines_extracts_same_line_values_with_their_confidence():
+    parsed_data, field_confidence = lambda_function.parse_claim_lines(
+        ['Claim No: CLM-2024/001', 'Patient Name: John Doe', 'Claim Amount: Rs. 1,200.50'],
+        [98.0, 91.5, 87.0]
+    )
+
+    assert parsed_data == {
+        'claim_number': 'CLM-2024/001',
+        'patient_name': 'John Doe',
+        'claim_amount': '1,200.50'
+    }
+    assert field_confidence == {'claim_number': 98.0, 'patient_name': 91.5, 'claim_amount': 87.0}
+
+
+def test_parse_claim_lines_takes_value_from_line_after_label_only_line():
+    parsed_data, field_confidence = lambda_function.parse_claim_lines(
+        ['Patient Name:', 'John Doe', 'Hospital Name: City Care'],
+        [95.0, 80.0, 90.0]
+    )
+
+    assert parsed_data == {'patient_name': 'John Doe', 'hospital_name': 'City Care'}
+    assert field_confidence == {'patient_name': 80.0, 'hospital_name': 90.0}
+
+
+def test_parse_claim_lines_does_not_take_value_from_a_labelled_line():
+    parsed_data, _ = lambda_function.parse_claim_lines(
+        ['Patient Name:', 'Hospital Name: City Care'],
+        [95.0, 90.0]
+    )
+
+    assert parsed_data == {'hospital_name': 'City Care'}
+
+
+def test_parse_claim_lines_leaves_fields_without_a_label_absent():
+    parsed_data, field_confidence = lambda_function.parse_claim_lines(
+        ['Denied Amount:', 'John Doe', 'Patient Name:'],
+        [95.0, 90.0, 85.0]
+    )
+
+    assert parsed_data == {}
+    assert field_confidence == {}
+
+
+# parse_amount
+
+@pytest.mark.parametrize('amount, expected', [
+    ('Rs. 1,200.50', 1200.50),
+    ('₹ 300', 300.0),
+    ('45,000', 45000.0),
+    ('-50.25', -50.25),
+    ('', 0.0),
+    (None, 0.0),
+    ('N/A', 0.0)
+])
+def test_parse_amount(amount, expected):
+    assert lambda_function.parse_amount(amount) == expected
+
+
+# process_csv_file
+
+def test_process_csv_file_parses_first_row_and_counts_data_rows():
+    content = (
+        b'\r\n'
+        b'Claim_No, Patient_Name ,Amount\r\n'
+        b'CLM-1,"Doe, John","1,200"\r\n'
+        b' , , \r\n'
+        b'CLM-2,Jane Roe,500\r\n'
+        b'CLM-3,short row\r\n'
+    )
+
+    result = lambda_function.process_csv_file({}, content)
+
+    assert result['headers'] == ['Claim_No', 'Patient_Name', 'Amount']
+    assert result['row_count'] == 2
+    assert result['parsed_data']['claim_number'] == 'CLM-1'
+    assert result['parsed_data']['patient_name'] == 'Doe, John'
+    assert result['parsed_data']['claim_amount'] == '1,200'
+    assert result['parsed_data']['total_records'] == 2
+    assert result['summary'] == {'total_rows': 2, 'total_columns': 3, 'fields_extracted': 5}
+
+
+def test_process_csv_file_skips_whitespace_only_rows_in_single_column_csv():
+    result = lambda_function.process_csv_file({}, bytearray(b'claim_no\n  \nCLM-1\n'))
+
+    assert result['row_count'] == 1
+    assert result['parsed_data']['claim_number'] == 'CLM-1'
+
+
+def test_process_csv_file_rejects_blank_file():
+    with pytest.raises(ValueError, match='Empty CSV file'):
+        lambda_function.process_csv_file({}, b'\n \n')
+
+
+# download_file_from_s3
+
+def test_download_file_from_s3_assembles_ranges_in_order(monkeypatch):
+    data = bytes(range(256)) * 40
+    s3_client = FakeS3Client(data)
+    monkeypatch.setattr(lambda_function, 'S3_DOWNLOAD_CHUNK_SIZE', 1000)
+    monkeypatch.setattr(lambda_function, 'get_s3_client', lambda: s3_client)
+
+    content = lambda_function.download_file_from_s3('bucket', 'claims/file.csv')
+
+    assert content == data
+    assert len(s3_client.calls) == 11
+    assert s3_client.calls[0] == {'Range': 'bytes=0-999', 'IfMatch': None}
+    assert {'Range': 'bytes=10000-10239', 'IfMatch': '"test-etag"'} in s3_client.calls
+
+
+def test_download_file_from_s3_returns_small_object_from_first_range(monkeypatch):
+    s3_client = FakeS3Client(b'claim_no\nCLM-1\n')
+    monkeypatch.setattr(lambda_function, 'get_s3_client', lambda: s3_client)
+
+    assert lambda_function.download_file_from_s3('bucket', 'key') == b'claim_no\nCLM-1\n'
+    assert len(s3_client.calls) == 1
+
+
+def test_download_file_from_s3_returns_empty_content_for_empty_object(monkeypatch):
+    monkeypatch.setattr(lambda_function, 'get_s3_client', lambda: FakeS3Client(b''))
+
+    assert lambda_function.download_file_from_s3('bucket', 'key') == b''
+
+
+def test_download_file_from_s3_rejects_short_range_read(monkeypatch):
+    s3_client = FakeS3Client(bytes(2500), short_read_at=1000)
+    monkeypatch.setattr(lambda_function, 'S3_DOWNLOAD_CHUNK_SIZE', 1000)
+    monkeypatch.setattr(lambda_function, 'get_s3_client', lambda: s3_client)
+
+    with pytest.raises(IOError, match='bytes 1000-1999'):
+        lambda_function.download_file_from_s3('bucket', 'key')
+
+
+# Textract
+
+def test_detect_document_text_from_s3_backs_off_and_collects_all_pages(monkeypatch, sleeps):
+    textract_client = FakeTextractClient([
+        {'JobStatus': 'IN_PROGRESS'},
+        {'JobStatus': 'IN_PROGRESS'},
+        {'JobStatus': 'IN_PROGRESS'},
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [line_block('page 1')], 'NextToken': 'page-2'},
+        {'JobStatus': 'SUCCEEDED', 'Blocks': [line_block('page 2')]}
+    ])
+    monkeypatch.setattr(lambda_function, 'get_textract_client', lambda: textract_client)
+
+    blocks = lambda_function.detect_document_text_from_s3('bucket', 'key', FakeContext(600000))
+
+    assert [block['Text'] for block in blocks] == ['page 1', 'page 2']
+    assert sleeps == [1, 1.5, 2.25, 3.375]
+    assert textract_client.get_calls[-1] == {'JobId': 'job-1', 'NextToken': 'page-2'}
+
+
+def test_detect_document_text_from_s3_caps_poll_interval(monkeypatch, sleeps):
+    textract_client = FakeTextractClient(
+        [{'JobStatus': 'IN_PROGRESS'}] * 8 + [{'JobStatus': 'SUCCEEDED', 'Blocks': []}]
+    )
+    monkeypatch.setattr(lambda_function, 'get_textract_client', lambda: textract_client)
+
+    lambda_function.detect_document_text_from_s3('bucket', 'key')
+
+    assert max(sleeps) == lambda_function.TEXTRACT_POLL_MAX_INTERVAL_SECONDS
+
+
+def test_detect_document_text_from_s3_times_out_before_invocation_deadline(monkeypatch, sleeps):
+    textract_client = FakeTextractClient([{'JobStatus': 'IN_PROGRESS'}] * 10)
+    monkeypatch.setattr(lambda_function, 'get_textract_client', lambda: textract_client)
+    context = FakeContext(lambda_function.TEXTRACT_POLL_SAFETY_MARGIN_MS + 500)
+
+    with pytest.raises(TimeoutError, match='job-1'):
+        lambda_function.detect_document_text_from_s3('bucket', 'key', context)
+
+    assert sleeps == []
+    assert textract_client.get_calls == []
+
+
+def test_detect_document_text_from_s3_raises_on_failed_job(monkeypatch, sleeps):
+    textract_client = FakeTextractClient([{'JobStatus': 'FAILED', 'StatusMessage': 'bad document'}])
+    monkeypatch.setattr(lambda_function, 'get_textract_client', lambda: textract_client)
+
+    with pytest.raises(RuntimeError, match='bad document'):
+        lambda_function.detect_document_text_from_s3('bucket', 'key')
+
+
+def test_process_pdf_file_uses_async_job_only_for_unsupported_documents(monkeypatch):
+    class SyncRejectingTextractClient:
+        def detect_document_text(self, Document):
+            assert Document == {'S3Object': {'Bucket': 'bucket', 'Name': 'claims/multi-page.pdf'}}
+            raise client_error('UnsupportedDocumentException', 'DetectDocumentText')
+
+    async_calls = []
+
+    def fake_async_detection(bucket, key, context=None):
+        async_calls.append((bucket, key))
+        return [line_block('Claim No: CLM-9')]
+
+    monkeypatch.setattr(lambda_function, 'get_textract_client', SyncRejectingTextractClient)
+    monkeypatch.setattr(lambda_function, 'detect_document_text_from_s3', fake_async_detection)
+
+    result = lambda_function.process_pdf_file({'s3_bucket': 'bucket', 's3_key': 'claims/multi-page.pdf'})
+
+    assert async_calls == [('bucket', 'claims/multi-page.pdf')]
+    assert result['parsed_data'] == {'claim_number': 'CLM-9'}
@@ -16,33 +16,34 @@ Requirements validated:
 - 2.5: Handle duplicate claims with version history
 """
 
+import base64
+import csv
+import io
 import json
 import os
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 import logging
-from datetime import datetime
-from typing import Dict, Any, List, Optional
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
 import uuid
 import re
-from aurora_data_api import AuroraDataAPI
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+# Prefer RE2's linear-time matcher for claim text extraction; fall back to the
+# standard library engine where the google-re2 wheel is unavailable
+try:
+    import re2 as claim_regex
+except ImportError:
+    claim_regex = re
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize AWS clients
-s3_client = boto3.client('s3')
-textract_client = boto3.client('textract')
-dynamodb = boto3.resource('dynamodb')
-
-# Initialize Aurora Data API client (much cleaner than RDS Data API)
-aurora_client = AuroraDataAPI(
-    resource_arn=os.environ['AURORA_CLUSTER_ARN'],
-    secret_arn=os.environ['AURORA_SECRET_ARN'],
-    database=os.environ.get('DATABASE_NAME', 'claimiq')
-)
-
 # Environment variables
 ENVIRONMENT = os.environ['ENVIRONMENT']
 CLAIMS_BUCKET_NAME = os.environ['CLAIMS_BUCKET_NAME']
@@ -50,6 +51,124 @@ AURORA_CLUSTER_ARN = os.environ['AURORA_CLUSTER_ARN']
 AURORA_SECRET_ARN = os.environ['AURORA_SECRET_ARN']
 AGENT_LOGS_TABLE = os.environ['AGENT_LOGS_TABLE']
 
+# Parallel ranged S3 download settings
+S3_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+S3_DOWNLOAD_MAX_WORKERS = 8
+
+# Asynchronous Textract job polling: exponential backoff between status
+# checks, and the invocation time kept in reserve so a job that outlasts the
+# Lambda still goes through the handler's error path
+TEXTRACT_POLL_INITIAL_INTERVAL_SECONDS = 1
+TEXTRACT_POLL_MAX_INTERVAL_SECONDS = 10
+TEXTRACT_POLL_BACKOFF_FACTOR = 1.5
+TEXTRACT_POLL_SAFETY_MARGIN_MS = 30000
+
+# Common patterns for Indian insurance claims as (label, value) pairs; the
+# value's first group is the extracted field
+CLAIM_FIELD_PATTERNS = {
+    'claim_number': (r'claim\s*(?:no|number|#)', r'([A-Z0-9\-/]+)'),
+    'policy_number': (r'policy\s*(?:no|number|#)', r'([A-Z0-9\-/]+)'),
+    'patient_name': (r'patient\s*name', r'([A-Za-z\s]+)'),
+    'hospital_name': (r'hospital\s*name', r'([A-Za-z\s&.]+)'),
+    'admission_date': (r'admission\s*date', r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'),
+    'discharge_date': (r'discharge\s*date', r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})'),
+    'claim_amount': (r'claim\s*amount', r'(?:rs\.?|₹)?\s*([0-9,]+(?:\.\d{2})?)'),
+    'denied_amount': (r'denied\s*amount', r'(?:rs\.?|₹)?\s*([0-9,]+(?:\.\d{2})?)'),
+    'denial_reason': (r'denial\s*reason', r'([A-Za-z\s,.-]+)')
+}
+
+# Patterns compiled once per container. Case-insensitivity is set inline
+# because RE2 does not accept re flags.
+CLAIM_TEXT_PATTERNS = tuple(
+    (field, claim_regex.compile('(?i)(?:' + label + r'[\s:]*' + value + ')'))
+    for field, (label, value) in CLAIM_FIELD_PATTERNS.items()
+)
+
+# Textract can put a label ("Patient Name:") and its value on separate lines:
+# a line ending in a field's label is followed up with just the value pattern
+# on the next line, unless that line carries a label of its own
+CLAIM_LABEL_ONLY_PATTERNS = {
+    field: claim_regex.compile('(?i)' + label + r'[\s:]*$')
+    for field, (label, _) in CLAIM_FIELD_PATTERNS.items()
+}
+CLAIM_VALUE_PATTERNS = {
+    field: claim_regex.compile(r'(?i)^\s*' + value)
+    for field, (_, value) in CLAIM_FIELD_PATTERNS.items()
+}
+CLAIM_LABEL_PATTERN = claim_regex.compile(
+    '(?i)' + '|'.join('(?:' + label + ')' for label, _ in CLAIM_FIELD_PATTERNS.values())
+)
+
+# Common CSV column name mappings, in order of preference per field
+CSV_COLUMN_MAPPINGS = {
+    'claim_number': ['claim_no', 'claim_number', 'claimno', 'claim_id'],
+    'policy_number': ['policy_no', 'policy_number', 'policyno', 'policy_id'],
+    'patient_name': ['patient_name', 'patient', 'name', 'member_name'],
+    'hospital_name': ['hospital_name', 'hospital', 'provider_name', 'provider'],
+    'claim_amount': ['claim_amount', 'amount', 'total_amount', 'bill_amount'],
+    'denied_amount': ['denied_amount', 'denial_amount', 'rejected_amount'],
+    'denial_reason': ['denial_reason', 'reason', 'rejection_reason', 'remarks']
+}
+
+# Reverse index: normalized column name -> (field, preference rank)
+CSV_FIELD_BY_COLUMN = {
+    column: (field, priority)
+    for field, columns in CSV_COLUMN_MAPPINGS.items()
+    for priority, column in enumerate(columns)
+}
+
+# Currency markers ("Rs." as a unit so its dot is not kept), separators and
+# any other non-numeric characters stripped from amount strings
+AMOUNT_STRIP_PATTERN = re.compile(r'rs\.|[^\d.\-]', re.IGNORECASE)
+
+
+# Shared botocore settings: keep-alive connections reused across warm
+# invocations and adaptive client-side retries
+AWS_CLIENT_CONFIG = Config(
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    tcp_keepalive=True
+)
+
+
+# Lazily initialized clients, created on first use and reused on warm invocations
+@functools.lru_cache(maxsize=1)
+def get_s3_client():
+    return boto3.client('s3', config=AWS_CLIENT_CONFIG)
+
+
+@functools.lru_cache(maxsize=1)
+def get_textract_client():
+    return boto3.client('textract', config=AWS_CLIENT_CONFIG)
+
+
+@functools.lru_cache(maxsize=1)
+def get_agent_logs_table():
+    return boto3.resource('dynamodb', config=AWS_CLIENT_CONFIG).Table(AGENT_LOGS_TABLE)
+
+
+@functools.lru_cache(maxsize=1)
+def get_aurora_client():
+    """Aurora Data API connection over an rds-data client using the shared config."""
+    import aurora_data_api
+    
+    return aurora_data_api.connect(
+        aurora_cluster_arn=AURORA_CLUSTER_ARN,
+        secret_arn=AURORA_SECRET_ARN,
+        database=os.environ.get('DATABASE_NAME', 'claimiq'),
+        rds_data_client=boto3.client('rds-data', config=AWS_CLIENT_CONFIG)
+    )
+
+
+def execute_aurora_statement(aurora_client, sql: str, parameters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Run one statement in its own transaction and return the rows as dicts."""
+    with aurora_client as connection:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parameters)
+            if not cursor.description:
+                return []
+            columns = [column.name for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
 
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
@@ -74,8 +193,12 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
         if not claim_info:
             raise ValueError(f"Claim not found: {claim_id}")
         
+        # Small files may be inlined in the event to skip the S3 download
+        inline_bytes_b64 = event.get('inline_bytes_b64')
+        inline_content = base64.b64decode(inline_bytes_b64, validate=True) if inline_bytes_b64 else None
+        
         # Process the file based on content type
-        processing_result = process_claim_file(claim_info)
+        processing_result = process_claim_file(claim_info, inline_content, context)
         
         # Create normalized entities
         entities_result = create_normalized_entities(claim_info, processing_result)
@@ -93,17 +216,35 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error in normalization for claim {event.get('claim_id', 'unknown')}: {str(e)}")
         
-        # Mark for manual review (Property 4)
-        mark_for_manual_review(event.get('claim_id'), str(e))
-        
-        # Log error event
-        log_normalization_event(
-            event.get('claim_id', 'unknown'), 
-            event.get('tenant_id', 'unknown'), 
-            'ERROR', 
-            {'error': str(e)}
+        # Mark for manual review (Property 4) and log the error event. The two
+        # writes are independent and swallow their own errors, so they run
+        # concurrently; leaving the block waits for both to finish.
+        error_writes = (
+            (get_aurora_client, mark_for_manual_review, (event.get('claim_id'), str(e))),
+            (get_agent_logs_table, log_normalization_event, (
+                event.get('claim_id', 'unknown'), 
+                event.get('tenant_id', 'unknown'), 
+                'ERROR', 
+                {'error': str(e)}
+            ))
         )
         
+        # Clients are created here before any write starts: the lru_cache
+        # getters and boto3's default session are not safe to initialize from
+        # two threads at once
+        ready_writes = []
+        for get_client, write, args in error_writes:
+            try:
+                get_client()
+            except Exception as client_error:
+                logger.error(f"Error creating client for error handling: {str(client_error)}")
+                continue
+            ready_writes.append((write, args))
+        
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            for write, args in ready_writes:
+                executor.submit(write, *args)
+        
         return {
             'status': 'error',
             'claim_id': event.get('claim_id'),
@@ -114,16 +255,20 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
 def get_claim_info(claim_id: str) -> Optional[Dict[str, Any]]:
     """Retrieve claim information from Aurora database using clean API."""
+    # Client setup failures propagate instead of reading as a missing claim
+    aurora_client = get_aurora_client()
+    
     try:
         # Much cleaner query with aurora-data-api - no parameter type mapping!
-        result = aurora_client.execute(
+        result = execute_aurora_statement(
+            aurora_client,
             """
             SELECT claim_id, tenant_id, hospital_id, original_filename, 
-                   content_type, file_size, s3_bucket, s3_key, status
+                   content_type, s3_bucket, s3_key
             FROM claims 
             WHERE claim_id = :claim_id
             """,
-            parameters={'claim_id': claim_id}
+            {'claim_id': claim_id}
         )
         
         if not result:
@@ -136,10 +281,8 @@ def get_claim_info(claim_id: str) -> Optional[Dict[str, Any]]:
             'hospital_id': record['hospital_id'],
             'original_filename': record['original_filename'],
             'content_type': record['content_type'],
-            'file_size': record['file_size'],
             's3_bucket': record['s3_bucket'],
-            's3_key': record['s3_key'],
-            'status': record['status']
+            's3_key': record['s3_key']
         }
         
     except Exception as e:
@@ -147,21 +290,25 @@ def get_claim_info(claim_id: str) -> Optional[Dict[str, Any]]:
         return None
 
 
-def process_claim_file(claim_info: Dict[str, Any]) -> Dict[str, Any]:
+def process_claim_file(claim_info: Dict[str, Any], file_content: Optional[bytes] = None, context: Any = None) -> Dict[str, Any]:
     """
     Process claim file based on content type.
     
-    Handles PDF (via Textract), Excel, and CSV files.
+    Handles PDF (via Textract), Excel, and CSV files. The file is downloaded
+    from S3 unless its content was passed inline by the caller.
     """
     content_type = claim_info['content_type'].split(';')[0].strip()
     
     try:
+        # Textract reads PDFs straight from S3, so they are never downloaded here
+        if content_type == 'application/pdf':
+            return process_pdf_file(claim_info, file_content, context)
+        
         # Download file from S3
-        file_content = download_file_from_s3(claim_info['s3_bucket'], claim_info['s3_key'])
+        if file_content is None:
+            file_content = download_file_from_s3(claim_info['s3_bucket'], claim_info['s3_key'])
         
-        if content_type == 'application/pdf':
-            return process_pdf_file(claim_info, file_content)
-        elif content_type in ['application/vnd.ms-excel', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet']:
+        if content_type in ['application/vnd.ms-excel', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet']:
             return process_excel_file(claim_info, file_content)
         elif content_type == 'text/csv':
             return process_csv_file(claim_info, file_content)
@@ -173,53 +320,114 @@ def process_claim_file(claim_info: Dict[str, Any]) -> Dict[str, Any]:
         raise
 
 
-def download_file_from_s3(bucket: str, key: str) -> bytes:
-    """Download file content from S3."""
+def download_file_from_s3(bucket: str, key: str) -> Union[bytes, bytearray]:
+    """
+    Download file content from S3.
+    
+    The first chunk is fetched with a ranged GET; if the object is larger,
+    the remaining byte ranges are downloaded in parallel into one bytearray,
+    which is returned as is rather than copied into bytes.
+    """
+    s3_client = get_s3_client()
+    
     try:
-        response = s3_client.get_object(Bucket=bucket, Key=key)
-        return response['Body'].read()
+        try:
+            first_response = s3_client.get_object(
+                Bucket=bucket, Key=key, Range=f'bytes=0-{S3_DOWNLOAD_CHUNK_SIZE - 1}'
+            )
+        except ClientError as e:
+            # Ranged GET on an empty object is rejected with InvalidRange
+            if e.response.get('Error', {}).get('Code') == 'InvalidRange':
+                return b''
+            raise
+        
+        first_chunk = first_response['Body'].read()
+        content_range = first_response.get('ContentRange', '')
+        total_size = int(content_range.rsplit('/', 1)[-1]) if content_range else len(first_chunk)
+        
+        if total_size <= len(first_chunk):
+            return first_chunk
+        
+        buffer = bytearray(total_size)
+        view = memoryview(buffer)
+        view[:len(first_chunk)] = first_chunk
+        etag = first_response['ETag']
+        
+        def fetch_range(start: int) -> None:
+            end = min(start + S3_DOWNLOAD_CHUNK_SIZE, total_size) - 1
+            # IfMatch guards against the object changing between ranged GETs
+            response = s3_client.get_object(
+                Bucket=bucket, Key=key, Range=f'bytes={start}-{end}', IfMatch=etag
+            )
+            chunk = response['Body'].read()
+            if len(chunk) != end - start + 1:
+                raise IOError(f"Short read for s3://{bucket}/{key} bytes {start}-{end}: got {len(chunk)} bytes")
+            view[start:end + 1] = chunk
+        
+        range_starts = range(len(first_chunk), total_size, S3_DOWNLOAD_CHUNK_SIZE)
+        max_workers = min(S3_DOWNLOAD_MAX_WORKERS, len(range_starts))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(fetch_range, range_starts))
+        
+        view.release()
+        return buffer
+        
     except ClientError as e:
         logger.error(f"Error downloading file from S3: {str(e)}")
         raise
 
 
-def process_pdf_file(claim_info: Dict[str, Any], file_content: bytes) -> Dict[str, Any]:
+def process_pdf_file(claim_info: Dict[str, Any], file_content: Optional[bytes] = None, context: Any = None) -> Dict[str, Any]:
     """
     Process PDF file using Amazon Textract.
     
-    Extracts text and attempts to identify key claim information.
+    Extracts text and attempts to identify key claim information. Textract
+    reads the inline content or the S3 object synchronously; S3 documents it
+    rejects for synchronous detection (multi-page PDFs) go through an
+    asynchronous job instead.
     """
     try:
         # Use Textract to extract text
-        response = textract_client.detect_document_text(
-            Document={'Bytes': file_content}
-        )
-        
-        # Extract text blocks
-        extracted_text = ""
-        text_blocks = []
-        
-        for block in response['Blocks']:
+        textract_client = get_textract_client()
+        if file_content is not None:
+            blocks = textract_client.detect_document_text(
+                Document={'Bytes': file_content}
+            )['Blocks']
+        else:
+            bucket, key = claim_info['s3_bucket'], claim_info['s3_key']
+            try:
+                blocks = textract_client.detect_document_text(
+                    Document={'S3Object': {'Bucket': bucket, 'Name': key}}
+                )['Blocks']
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') != 'UnsupportedDocumentException':
+                    raise
+                blocks = detect_document_text_from_s3(bucket, key, context)
+        
+        # Extract LINE blocks as parallel text/confidence lists
+        line_texts = []
+        line_confidences = []
+        
+        for block in blocks:
             if block['BlockType'] == 'LINE':
-                text = block.get('Text', '')
-                extracted_text += text + "\n"
-                text_blocks.append({
-                    'text': text,
-                    'confidence': block.get('Confidence', 0),
-                    'geometry': block.get('Geometry', {})
-                })
+                line_texts.append(block.get('Text', ''))
+                line_confidences.append(block.get('Confidence', 0))
         
-        # Parse extracted text for claim information
-        parsed_data = parse_claim_text(extracted_text)
+        # Parse the lines directly for claim information
+        parsed_data, field_confidence = parse_claim_lines(line_texts, line_confidences)
         
         return {
             'processing_type': 'pdf_textract',
-            'extracted_text': extracted_text,
-            'text_blocks': text_blocks,
+            'text_blocks': {
+                'text': line_texts,
+                'confidence': line_confidences
+            },
             'parsed_data': parsed_data,
+            'field_confidence': field_confidence,
             'summary': {
-                'total_blocks': len(text_blocks),
-                'total_characters': len(extracted_text),
+                'total_blocks': len(line_texts),
+                # One newline per line, as when the lines are joined into a text
+                'total_characters': sum(len(text) for text in line_texts) + len(line_texts),
                 'fields_extracted': len(parsed_data)
             }
         }
@@ -229,6 +437,56 @@ def process_pdf_file(claim_info: Dict[str, Any], file_content: bytes) -> Dict[st
         raise
 
 
+def detect_document_text_from_s3(bucket: str, key: str, context: Any = None) -> List[Dict[str, Any]]:
+    """
+    Run an asynchronous Textract text detection job and collect all result blocks.
+    
+    Polling backs off exponentially and, when a Lambda context is given, gives
+    up with a TimeoutError before the invocation runs out of time.
+    """
+    textract_client = get_textract_client()
+    
+    try:
+        job_id = textract_client.start_document_text_detection(
+            DocumentLocation={'S3Object': {'Bucket': bucket, 'Name': key}}
+        )['JobId']
+        
+        # Poll until the job leaves IN_PROGRESS
+        interval = TEXTRACT_POLL_INITIAL_INTERVAL_SECONDS
+        while True:
+            if context is not None:
+                remaining_ms = context.get_remaining_time_in_millis()
+                if remaining_ms - interval * 1000 < TEXTRACT_POLL_SAFETY_MARGIN_MS:
+                    raise TimeoutError(
+                        f"Textract job {job_id} still in progress with {remaining_ms} ms of invocation time left"
+                    )
+            
+            time.sleep(interval)
+            response = textract_client.get_document_text_detection(JobId=job_id)
+            if response['JobStatus'] != 'IN_PROGRESS':
+                break
+            interval = min(interval * TEXTRACT_POLL_BACKOFF_FACTOR, TEXTRACT_POLL_MAX_INTERVAL_SECONDS)
+        
+        if response['JobStatus'] == 'FAILED':
+            raise RuntimeError(f"Textract job {job_id} failed: {response.get('StatusMessage', 'unknown error')}")
+        if response['JobStatus'] == 'PARTIAL_SUCCESS':
+            logger.warning(f"Textract job {job_id} partially succeeded: {response.get('Warnings', [])}")
+        
+        # Results are paginated for larger documents
+        blocks = list(response['Blocks'])
+        next_token = response.get('NextToken')
+        while next_token:
+            response = textract_client.get_document_text_detection(JobId=job_id, NextToken=next_token)
+            blocks.extend(response['Blocks'])
+            next_token = response.get('NextToken')
+        
+        return blocks
+        
+    except ClientError as e:
+        logger.error(f"Error running Textract text detection: {str(e)}")
+        raise
+
+
 def process_excel_file(claim_info: Dict[str, Any], file_content: bytes) -> Dict[str, Any]:
     """
     Process Excel file.
@@ -267,33 +525,38 @@ def process_csv_file(claim_info: Dict[str, Any], file_content: bytes) -> Dict[st
     Parses CSV structure and extracts claim data.
     """
     try:
-        # Decode CSV content
+        # Decode CSV content; csv.reader handles quoted fields and CRLF line endings
         csv_text = file_content.decode('utf-8')
-        lines = csv_text.strip().split('\n')
+        reader = csv.reader(io.StringIO(csv_text, newline=''))
         
-        if not lines:
+        # Skip leading blank lines before the header row
+        header_row = next((row for row in reader if any(cell.strip() for cell in row)), None)
+        if not header_row:
             raise ValueError("Empty CSV file")
         
-        # Parse CSV structure
-        headers = [h.strip() for h in lines[0].split(',')]
-        rows = []
+        # Parse CSV structure; only the first row is materialized (single
+        # claim per CSV), the rest are just counted
+        headers = [h.strip() for h in header_row]
+        first_row = None
+        row_count = 0
         
-        for line in lines[1:]:
-            if line.strip():
-                row_data = [cell.strip() for cell in line.split(',')]
-                if len(row_data) == len(headers):
-                    rows.append(dict(zip(headers, row_data)))
+        # Whitespace-only rows are skipped like blank lines, whatever their width
+        for row_data in reader:
+            if len(row_data) == len(headers) and any(cell.strip() for cell in row_data):
+                if first_row is None:
+                    first_row = dict(zip(headers, (cell.strip() for cell in row_data)))
+                row_count += 1
         
         # Extract claim information from CSV data
-        parsed_data = parse_csv_claim_data(headers, rows)
+        parsed_data = parse_csv_claim_data(headers, first_row, row_count)
         
         return {
             'processing_type': 'csv_parsed',
             'headers': headers,
-            'rows': rows,
+            'row_count': row_count,
             'parsed_data': parsed_data,
             'summary': {
-                'total_rows': len(rows),
+                'total_rows': row_count,
                 'total_columns': len(headers),
                 'fields_extracted': len(parsed_data)
             }
@@ -304,7 +567,7 @@ def process_csv_file(claim_info: Dict[str, Any], file_content: bytes) -> Dict[st
         raise
 
 
-def parse_claim_text(text: str) -> Dict[str, Any]:
+def parse_claim_text(text: str, patterns: Sequence[Tuple[str, Any]] = CLAIM_TEXT_PATTERNS) -> Dict[str, Any]:
     """
     Parse extracted text to identify claim information.
     
@@ -312,70 +575,96 @@ def parse_claim_text(text: str) -> Dict[str, Any]:
     """
     parsed_data = {}
     
-    # Common patterns for Indian insurance claims
-    patterns = {
-        'claim_number': r'(?:claim\s*(?:no|number|#)[\s:]*([A-Z0-9\-/]+))',
-        'policy_number': r'(?:policy\s*(?:no|number|#)[\s:]*([A-Z0-9\-/]+))',
-        'patient_name': r'(?:patient\s*name[\s:]*([A-Za-z\s]+))',
-        'hospital_name': r'(?:hospital\s*name[\s:]*([A-Za-z\s&.]+))',
-        'admission_date': r'(?:admission\s*date[\s:]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}))',
-        'discharge_date': r'(?:discharge\s*date[\s:]*(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}))',
-        'claim_amount': r'(?:claim\s*amount[\s:]*(?:rs\.?|₹)?\s*([0-9,]+(?:\.\d{2})?))',
-        'denied_amount': r'(?:denied\s*amount[\s:]*(?:rs\.?|₹)?\s*([0-9,]+(?:\.\d{2})?))',
-        'denial_reason': r'(?:denial\s*reason[\s:]*([A-Za-z\s,.-]+))'
-    }
-    
-    text_lower = text.lower()
-    
-    for field, pattern in patterns.items():
-        match = re.search(pattern, text_lower, re.IGNORECASE)
+    for field, pattern in patterns:
+        match = pattern.search(text)
         if match:
             parsed_data[field] = match.group(1).strip()
     
     return parsed_data
 
 
-def parse_csv_claim_data(headers: List[str], rows: List[Dict[str, str]]) -> Dict[str, Any]:
+def parse_claim_lines(lines: List[str], confidences: List[float]) -> Tuple[Dict[str, Any], Dict[str, float]]:
     """
-    Parse CSV data to extract claim information.
+    Parse Textract LINE texts to identify claim information.
     
-    Maps common CSV column names to standard claim fields.
+    Lines are matched one at a time so each value carries the confidence of
+    the line it came from, and scanning stops once every field is found.
+    A label-only line takes its value from the following line.
     """
     parsed_data = {}
+    field_confidence = {}
+    remaining = CLAIM_TEXT_PATTERNS
     
-    # Common column name mappings
-    column_mappings = {
-        'claim_number': ['claim_no', 'claim_number', 'claimno', 'claim_id'],
-        'policy_number': ['policy_no', 'policy_number', 'policyno', 'policy_id'],
-        'patient_name': ['patient_name', 'patient', 'name', 'member_name'],
-        'hospital_name': ['hospital_name', 'hospital', 'provider_name', 'provider'],
-        'claim_amount': ['claim_amount', 'amount', 'total_amount', 'bill_amount'],
-        'denied_amount': ['denied_amount', 'denial_amount', 'rejected_amount'],
-        'denial_reason': ['denial_reason', 'reason', 'rejection_reason', 'remarks']
-    }
+    for index, (text, confidence) in enumerate(zip(lines, confidences)):
+        if not remaining:
+            break
+        
+        next_index = index + 1
+        has_value_line = next_index < len(lines) and not CLAIM_LABEL_PATTERN.search(lines[next_index])
+        
+        unmatched = []
+        for field, pattern in remaining:
+            match = pattern.search(text)
+            value = match.group(1).strip() if match else ''
+            value_confidence = confidence
+            
+            if not value and has_value_line and CLAIM_LABEL_ONLY_PATTERNS[field].search(text):
+                match = CLAIM_VALUE_PATTERNS[field].search(lines[next_index])
+                value = match.group(1).strip() if match else ''
+                value_confidence = confidences[next_index]
+            
+            if value:
+                parsed_data[field] = value
+                field_confidence[field] = value_confidence
+            else:
+                unmatched.append((field, pattern))
+        remaining = unmatched
+    
+    return parsed_data, field_confidence
+
+
+def parse_csv_claim_data(headers: List[str], first_row: Optional[Dict[str, str]], total_records: int) -> Dict[str, Any]:
+    """
+    Parse CSV data to extract claim information.
     
-    # Normalize headers for matching
-    header_map = {h.lower().replace(' ', '_').replace('-', '_'): h for h in headers}
+    Maps common CSV column names to standard claim fields.
+    """
+    parsed_data = {}
     
     # Extract data from first row (assuming single claim per CSV)
-    if rows:
-        first_row = rows[0]
+    if first_row:
+        matches = {}
+        
+        # Single pass over the headers; when several columns map to the same
+        # field, the one listed first in CSV_COLUMN_MAPPINGS wins
+        for header in headers:
+            mapping = CSV_FIELD_BY_COLUMN.get(header.lower().replace(' ', '_').replace('-', '_'))
+            if not mapping:
+                continue
+            
+            field, priority = mapping
+            value = (first_row.get(header) or '').strip()
+            if value and (field not in matches or priority < matches[field][0]):
+                matches[field] = (priority, value)
         
-        for field, possible_columns in column_mappings.items():
-            for col in possible_columns:
-                if col in header_map and header_map[col] in first_row:
-                    value = first_row[header_map[col]]
-                    if value and value.strip():
-                        parsed_data[field] = value.strip()
-                        break
+        for field, (_, value) in matches.items():
+            parsed_data[field] = value
     
     # Add summary information
-    parsed_data['total_records'] = len(rows)
+    parsed_data['total_records'] = total_records
     parsed_data['columns_available'] = headers
     
     return parsed_data
 
 
+def parse_amount(amount: str) -> float:
+    """Convert an extracted amount such as 'Rs. 1,200.50' or '₹500' to a float, defaulting to 0.0."""
+    try:
+        return float(AMOUNT_STRIP_PATTERN.sub('', amount)) if amount else 0.0
+    except ValueError:
+        return 0.0
+
+
 def create_normalized_entities(claim_info: Dict[str, Any], processing_result: Dict[str, Any]) -> Dict[str, Any]:
     """
     Create normalized entities in Aurora Serverless v2.
@@ -393,25 +682,11 @@ def create_normalized_entities(claim_info: Dict[str, Any], processing_result: Di
         if not validation_result['valid']:
             raise ValueError(f"Validation failed: {validation_result['errors']}")
         
-        # Create/update Patient entity
-        patient_id = create_or_update_patient(claim_info, parsed_data)
-        entities_created['patient_id'] = patient_id
-        
-        # Create/update Payer entity
-        payer_id = create_or_update_payer(claim_info, parsed_data)
-        entities_created['payer_id'] = payer_id
-        
-        # Create Denial entity
-        denial_id = create_denial_entity(claim_info, parsed_data)
-        entities_created['denial_id'] = denial_id
-        
-        # Update Claim entity with extracted information
-        update_claim_entity(claim_info, parsed_data, patient_id, payer_id, denial_id)
+        # Create/update Patient, Payer and Denial entities and update the
+        # Claim (status DENIED) in one round-trip
+        entities_created.update(upsert_normalized_entities(claim_info, parsed_data))
         entities_created['claim_updated'] = True
         
-        # Update claim status to DENIED
-        update_claim_status(claim_info['claim_id'], 'DENIED')
-        
         return entities_created
         
     except Exception as e:
@@ -444,296 +719,136 @@ def validate_entity_data(claim_info: Dict[str, Any], parsed_data: Dict[str, Any]
     }
 
 
-def create_or_update_patient(claim_info: Dict[str, Any], parsed_data: Dict[str, Any]) -> str:
-    """Create or update patient entity with tenant isolation using clean API."""
-    
-    patient_name = parsed_data.get('patient_name', 'Unknown Patient')
-    patient_id = str(uuid.uuid4())
+def upsert_normalized_entities(claim_info: Dict[str, Any], parsed_data: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Create patient, payer and denial entities and link them to the claim.
     
-    try:
-        # Check if patient already exists - much cleaner!
-        existing_patients = aurora_client.execute(
-            """
-            SELECT patient_id, name 
-            FROM patients 
-            WHERE tenant_id = :tenant_id AND LOWER(name) = LOWER(:name)
-            LIMIT 1
-            """,
-            parameters={
-                'tenant_id': claim_info['tenant_id'],
-                'name': patient_name
-            }
-        )
-        
-        if existing_patients:
-            return existing_patients[0]['patient_id']
-        
-        # Create new patient record - no messy parameter mapping!
-        aurora_client.execute(
-            """
-            INSERT INTO patients (
-                patient_id, tenant_id, hospital_id, name, 
-                created_at, updated_at
-            ) VALUES (
-                :patient_id, :tenant_id, :hospital_id, :name,
-                NOW(), NOW()
-            )
-            """,
-            parameters={
-                'patient_id': patient_id,
-                'tenant_id': claim_info['tenant_id'],
-                'hospital_id': claim_info['hospital_id'],
-                'name': patient_name
-            }
-        )
-        
-        return patient_id
-        
-    except Exception as e:
-        logger.error(f"Error creating patient entity: {str(e)}")
-        raise
-
-
-def find_existing_patient(tenant_id: str, patient_name: str) -> Optional[Dict[str, Any]]:
-    """Find existing patient by name within tenant."""
-    try:
-        response = rds_data.execute_statement(
-            resourceArn=AURORA_CLUSTER_ARN,
-            secretArn=AURORA_SECRET_ARN,
-            database='claimiq',
-            sql="""
-                SELECT patient_id, name 
-                FROM patients 
-                WHERE tenant_id = :tenant_id AND LOWER(name) = LOWER(:name)
-                LIMIT 1
-            """,
-            parameters=[
-                {'name': 'tenant_id', 'value': {'stringValue': tenant_id}},
-                {'name': 'name', 'value': {'stringValue': patient_name}}
-            ]
-        )
-        
-        if response['records']:
-            record = response['records'][0]
-            return {
-                'patient_id': record[0]['stringValue'],
-                'name': record[1]['stringValue']
-            }
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Error finding existing patient: {str(e)}")
-        return None
-
-
-def create_or_update_payer(claim_info: Dict[str, Any], parsed_data: Dict[str, Any]) -> str:
-    """Create or update payer entity with tenant isolation using clean API."""
+    All writes run as a single statement so each claim costs one Data API
+    round-trip. Patients and payers are matched per tenant by case-insensitive
+    name (Requirement 2.2); the claim is moved to DENIED in the same update.
+    """
     
+    patient_name = parsed_data.get('patient_name', 'Unknown Patient')
     # Extract payer information (could be from hospital name or other fields)
     payer_name = parsed_data.get('hospital_name', 'Unknown Payer')
-    payer_id = str(uuid.uuid4())
-    
-    try:
-        # Check if payer already exists - clean and simple!
-        existing_payers = aurora_client.execute(
-            """
-            SELECT payer_id, name 
-            FROM payers 
-            WHERE tenant_id = :tenant_id AND LOWER(name) = LOWER(:name)
-            LIMIT 1
-            """,
-            parameters={
-                'tenant_id': claim_info['tenant_id'],
-                'name': payer_name
-            }
-        )
-        
-        if existing_payers:
-            return existing_payers[0]['payer_id']
-        
-        # Create new payer record - no parameter type mapping needed!
-        aurora_client.execute(
-            """
-            INSERT INTO payers (
-                payer_id, tenant_id, name, payer_type,
-                created_at, updated_at
-            ) VALUES (
-                :payer_id, :tenant_id, :name, 'TPA',
-                NOW(), NOW()
-            )
-            """,
-            parameters={
-                'payer_id': payer_id,
-                'tenant_id': claim_info['tenant_id'],
-                'name': payer_name
-            }
-        )
-        
-        return payer_id
-        
-    except Exception as e:
-        logger.error(f"Error creating payer entity: {str(e)}")
-        raise
-
-
-def find_existing_payer(tenant_id: str, payer_name: str) -> Optional[Dict[str, Any]]:
-    """Find existing payer by name within tenant."""
-    try:
-        response = rds_data.execute_statement(
-            resourceArn=AURORA_CLUSTER_ARN,
-            secretArn=AURORA_SECRET_ARN,
-            database='claimiq',
-            sql="""
-                SELECT payer_id, name 
-                FROM payers 
-                WHERE tenant_id = :tenant_id AND LOWER(name) = LOWER(:name)
-                LIMIT 1
-            """,
-            parameters=[
-                {'name': 'tenant_id', 'value': {'stringValue': tenant_id}},
-                {'name': 'name', 'value': {'stringValue': payer_name}}
-            ]
-        )
-        
-        if response['records']:
-            record = response['records'][0]
-            return {
-                'payer_id': record[0]['stringValue'],
-                'name': record[1]['stringValue']
-            }
-        
-        return None
-        
-    except Exception as e:
-        logger.error(f"Error finding existing payer: {str(e)}")
-        return None
-
-
-def create_denial_entity(claim_info: Dict[str, Any], parsed_data: Dict[str, Any]) -> str:
-    """Create denial entity using clean API."""
-    
-    denial_id = str(uuid.uuid4())
     denial_reason = parsed_data.get('denial_reason', 'Reason not specified')
     denied_amount = parsed_data.get('denied_amount', '0')
+    claim_number = parsed_data.get('claim_number', claim_info['original_filename'])
+    claim_amount = parsed_data.get('claim_amount', '0')
     
     try:
-        # Convert denied amount to numeric (basic validation)
-        try:
-            denied_amount_numeric = float(denied_amount.replace(',', '').replace('₹', '').replace('Rs.', ''))
-        except:
-            denied_amount_numeric = 0.0
-        
-        # Create denial record - much cleaner without parameter type mapping!
-        aurora_client.execute(
+        # Convert amounts to numeric (basic validation)
+        denied_amount_numeric = parse_amount(denied_amount)
+        claim_amount_numeric = parse_amount(claim_amount)
+        
+        # Existing patients/payers hit the (tenant_id, LOWER(name)) unique index
+        # and return their current id via the no-op DO UPDATE
+        result = execute_aurora_statement(
+            get_aurora_client(),
             """
-            INSERT INTO denials (
-                denial_id, claim_id, tenant_id, reason, 
-                denied_amount, denial_text, created_at, updated_at
-            ) VALUES (
-                :denial_id, :claim_id, :tenant_id, :reason,
-                :denied_amount, :denial_text, NOW(), NOW()
+            WITH patient AS (
+                INSERT INTO patients (
+                    patient_id, tenant_id, hospital_id, name,
+                    created_at, updated_at
+                ) VALUES (
+                    :patient_id, :tenant_id, :hospital_id, :patient_name,
+                    NOW(), NOW()
+                )
+                ON CONFLICT (tenant_id, (LOWER(name))) DO UPDATE SET updated_at = NOW()
+                RETURNING patient_id
+            ),
+            payer AS (
+                INSERT INTO payers (
+                    payer_id, tenant_id, name, payer_type,
+                    created_at, updated_at
+                ) VALUES (
+                    :payer_id, :tenant_id, :payer_name, 'TPA',
+                    NOW(), NOW()
+                )
+                ON CONFLICT (tenant_id, (LOWER(name))) DO UPDATE SET updated_at = NOW()
+                RETURNING payer_id
+            ),
+            denial AS (
+                INSERT INTO denials (
+                    denial_id, claim_id, tenant_id, reason, 
+                    denied_amount, denial_text, created_at, updated_at
+                ) VALUES (
+                    :denial_id, :claim_id, :tenant_id, :reason,
+                    :denied_amount, :denial_text, NOW(), NOW()
+                )
+                RETURNING denial_id
             )
+            UPDATE claims SET 
+                claim_number = :claim_number,
+                patient_id = patient.patient_id,
+                payer_id = payer.payer_id,
+                denial_id = denial.denial_id,
+                claim_amount = :claim_amount,
+                status = 'DENIED',
+                updated_at = NOW()
+            FROM patient, payer, denial
+            WHERE claims.claim_id = :claim_id
+            RETURNING claims.patient_id, claims.payer_id, claims.denial_id
             """,
-            parameters={
-                'denial_id': denial_id,
+            {
+                'patient_id': str(uuid.uuid4()),
+                'payer_id': str(uuid.uuid4()),
+                'denial_id': str(uuid.uuid4()),
                 'claim_id': claim_info['claim_id'],
                 'tenant_id': claim_info['tenant_id'],
+                'hospital_id': claim_info['hospital_id'],
+                'patient_name': patient_name,
+                'payer_name': payer_name,
                 'reason': denial_reason,
                 'denied_amount': denied_amount_numeric,
-                'denial_text': denial_reason
+                'denial_text': denial_reason,
+                'claim_number': claim_number,
+                'claim_amount': claim_amount_numeric
             }
         )
         
-        return denial_id
-        
-    except Exception as e:
-        logger.error(f"Error creating denial entity: {str(e)}")
-        raise
-
-
-def update_claim_entity(claim_info: Dict[str, Any], parsed_data: Dict[str, Any], patient_id: str, payer_id: str, denial_id: str) -> None:
-    """Update claim entity with extracted information using clean API."""
-    
-    try:
-        claim_number = parsed_data.get('claim_number', claim_info['original_filename'])
-        claim_amount = parsed_data.get('claim_amount', '0')
-        
-        # Convert claim amount to numeric
-        try:
-            claim_amount_numeric = float(claim_amount.replace(',', '').replace('₹', '').replace('Rs.', ''))
-        except:
-            claim_amount_numeric = 0.0
+        if not result:
+            raise ValueError(f"Claim not found: {claim_info['claim_id']}")
         
-        # Update claim record - clean and simple!
-        aurora_client.execute(
-            """
-            UPDATE claims SET 
-                claim_number = :claim_number,
-                patient_id = :patient_id,
-                payer_id = :payer_id,
-                denial_id = :denial_id,
-                claim_amount = :claim_amount,
-                updated_at = NOW()
-            WHERE claim_id = :claim_id
-            """,
-            parameters={
-                'claim_number': claim_number,
-                'patient_id': patient_id,
-                'payer_id': payer_id,
-                'denial_id': denial_id,
-                'claim_amount': claim_amount_numeric,
-                'claim_id': claim_info['claim_id']
-            }
-        )
+        record = result[0]
+        return {
+            'patient_id': record['patient_id'],
+            'payer_id': record['payer_id'],
+            'denial_id': record['denial_id']
+        }
         
     except Exception as e:
-        logger.error(f"Error updating claim entity: {str(e)}")
+        logger.error(f"Error upserting normalized entities: {str(e)}")
         raise
 
 
-def update_claim_status(claim_id: str, status: str) -> None:
-    """Update claim status using clean API."""
+def mark_for_manual_review(claim_id: str, error_message: str) -> None:
+    """
+    Mark claim for manual review using clean API.
+    
+    Property 4: Error Handling and Manual Review Flagging
+    Requirement 2.3: Mark records for manual review on processing failure
+    """
+    if not claim_id:
+        return
+    
+    aurora_client = get_aurora_client()
+    
     try:
-        aurora_client.execute(
+        execute_aurora_statement(
+            aurora_client,
             """
             UPDATE claims SET 
-                status = :status,
+                status = 'MANUAL_REVIEW_REQUIRED',
+                error_message = :error_message,
                 updated_at = NOW()
             WHERE claim_id = :claim_id
             """,
-            parameters={
-                'status': status,
+            {
+                'error_message': error_message,
                 'claim_id': claim_id
             }
         )
-    except Exception as e:
-        logger.error(f"Error updating claim status: {str(e)}")
-        raise
-
-
-def mark_for_manual_review(claim_id: str, error_message: str) -> None:
-    """
-    Mark claim for manual review using clean API.
-    
-    Property 4: Error Handling and Manual Review Flagging
-    Requirement 2.3: Mark records for manual review on processing failure
-    """
-    try:
-        if claim_id:
-            aurora_client.execute(
-                """
-                UPDATE claims SET 
-                    status = 'MANUAL_REVIEW_REQUIRED',
-                    error_message = :error_message,
-                    updated_at = NOW()
-                WHERE claim_id = :claim_id
-                """,
-                parameters={
-                    'error_message': error_message,
-                    'claim_id': claim_id
-                }
-            )
     except Exception as e:
         logger.error(f"Error marking claim for manual review: {str(e)}")
 
@@ -741,11 +856,11 @@ def mark_for_manual_review(claim_id: str, error_message: str) -> None:
 def log_normalization_event(claim_id: str, tenant_id: str, status: str, processing_result: Dict[str, Any]) -> None:
     """Log normalization event to DynamoDB."""
     try:
-        table = dynamodb.Table(AGENT_LOGS_TABLE)
-        
         log_entry = {
             'claim_id': claim_id,
-            'timestamp': datetime.utcnow().isoformat(),
+            # Same format as the TypeScript writers' toISOString() so the
+            # timestamp range key sorts consistently across functions
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
             'agent_type': 'NORMALIZATION',
             'tenant_id': tenant_id,
             'action': 'DATA_NORMALIZATION',
@@ -757,7 +872,7 @@ def log_normalization_event(claim_id: str, tenant_id: str, status: str, processi
         if 'error' in processing_result:
             log_entry['error_message'] = processing_result['error']
         
-        table.put_item(Item=log_entry)
+        get_agent_logs_table().put_item(Item=log_entry)
         
     except Exception as e:
         logger.error(f"Error logging normalization event: {str(e)}")
\ No newline at end of file
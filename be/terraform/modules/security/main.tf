@@ -152,7 +152,9 @@ resource "aws_iam_role_policy" "lambda_services" {
         Effect = "Allow"
         Action = [
           "textract:DetectDocumentText",
-          "textract:AnalyzeDocument"
+          "textract:AnalyzeDocument",
+          "textract:StartDocumentTextDetection",
+          "textract:GetDocumentTextDetection"
         ]
         Resource = "*"
       },
@@ -0,0 +1,71 @@
+-- Migration 001: unique (tenant_id, LOWER(name)) on patients and payers
+--
+-- The normalization Lambda upserts patients and payers with
+-- ON CONFLICT (tenant_id, (LOWER(name))), which needs these unique indexes.
+-- schema.sql creates them on fresh installs only; run this file once against
+-- existing databases.
+--
+-- Deploy order: apply this migration BEFORE deploying the normalization
+-- Lambda that uses the upsert, otherwise every normalization fails with
+-- "there is no unique or exclusion constraint matching the ON CONFLICT
+-- specification".
+--
+-- Run with psql outside an explicit transaction (no --single-transaction):
+-- CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+--   psql -h <aurora-endpoint> -U claimiq_admin -d claimiq \
+--        -f database/migrations/001_patients_payers_tenant_name_unique.sql
+
+-- Step 1: merge duplicate patients/payers per tenant and case-insensitive
+-- name. The oldest row survives; claims are repointed to it before the
+-- duplicates are deleted.
+BEGIN;
+
+CREATE TEMP TABLE patient_duplicates ON COMMIT DROP AS
+SELECT patient_id, keep_id
+FROM (
+    SELECT patient_id,
+           FIRST_VALUE(patient_id) OVER (
+               PARTITION BY tenant_id, LOWER(name)
+               ORDER BY created_at, patient_id
+           ) AS keep_id
+    FROM patients
+) ranked
+WHERE patient_id <> keep_id;
+
+UPDATE claims c
+SET patient_id = d.keep_id, updated_at = NOW()
+FROM patient_duplicates d
+WHERE c.patient_id = d.patient_id;
+
+DELETE FROM patients p
+USING patient_duplicates d
+WHERE p.patient_id = d.patient_id;
+
+CREATE TEMP TABLE payer_duplicates ON COMMIT DROP AS
+SELECT payer_id, keep_id
+FROM (
+    SELECT payer_id,
+           FIRST_VALUE(payer_id) OVER (
+               PARTITION BY tenant_id, LOWER(name)
+               ORDER BY created_at, payer_id
+           ) AS keep_id
+    FROM payers
+) ranked
+WHERE payer_id <> keep_id;
+
+UPDATE claims c
+SET payer_id = d.keep_id, updated_at = NOW()
+FROM payer_duplicates d
+WHERE c.payer_id = d.payer_id;
+
+DELETE FROM payers p
+USING payer_duplicates d
+WHERE p.payer_id = d.payer_id;
+
+COMMIT;
+
+-- Step 2: build the unique indexes without blocking writes. A failed build
+-- (interrupted, or a duplicate inserted since step 1) leaves an INVALID index;
+-- drop it and re-run this file.
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_patients_tenant_name ON patients(tenant_id, LOWER(name));
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_payers_tenant_name ON payers(tenant_id, LOWER(name));
@@ -204,7 +204,7 @@ CREATE TABLE IF NOT EXISTS recovery_logs (
     original_denied_amount DECIMAL(15,2) NOT NULL,
     recovered_amount DECIMAL(15,2) DEFAULT 0,
     processing_cost DECIMAL(15,2) DEFAULT 0,
-    net_recovery DECIMAL(15,2) GENERATED ALWAYS AS (recovered_amount - processing_cost) STORED,
+    -- net_recovery is computed on read by the recovery_logs_summary view
     
     -- Timing
     recovery_date DATE,
@@ -221,10 +221,10 @@ CREATE TABLE IF NOT EXISTS recovery_logs (
 -- Indexes for performance and tenant isolation
 
 -- Tenant isolation indexes (critical for multi-tenant queries)
+-- claims has no standalone tenant_id index: the composite indexes below all lead with tenant_id
 CREATE INDEX IF NOT EXISTS idx_hospitals_tenant_id ON hospitals(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_patients_tenant_id ON patients(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_payers_tenant_id ON payers(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_claims_tenant_id ON claims(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_denials_tenant_id ON denials(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_appeals_tenant_id ON appeals(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_agent_actions_tenant_id ON agent_actions(tenant_id);
@@ -237,6 +237,11 @@ CREATE INDEX IF NOT EXISTS idx_claims_hospital_status ON claims(hospital_id, sta
 CREATE INDEX IF NOT EXISTS idx_claims_created_at ON claims(created_at);
 CREATE INDEX IF NOT EXISTS idx_claims_file_hash ON claims(file_hash);
 
+-- Case-insensitive name lookups (also the ON CONFLICT targets for normalization upserts)
+-- Existing databases get these from migrations/001_patients_payers_tenant_name_unique.sql
+CREATE UNIQUE INDEX IF NOT EXISTS idx_patients_tenant_name ON patients(tenant_id, LOWER(name));
+CREATE UNIQUE INDEX IF NOT EXISTS idx_payers_tenant_name ON payers(tenant_id, LOWER(name));
+
 -- Denial and appeal indexes
 CREATE INDEX IF NOT EXISTS idx_denials_claim_id ON denials(claim_id);
 CREATE INDEX IF NOT EXISTS idx_appeals_claim_id ON appeals(claim_id);
@@ -333,22 +338,30 @@ SELECT
     c.hospital_id,
     h.name as hospital_name,
     COUNT(*) as total_claims,
-    COUNT(CASE WHEN c.status = 'DENIED' THEN 1 END) as denied_claims,
-    COUNT(CASE WHEN c.status = 'RECOVERED' THEN 1 END) as recovered_claims,
+    COUNT(*) FILTER (WHERE c.status = 'DENIED') as denied_claims,
+    COUNT(*) FILTER (WHERE c.status = 'RECOVERED') as recovered_claims,
     SUM(c.claim_amount) as total_claim_amount,
     SUM(c.denied_amount) as total_denied_amount,
     SUM(c.recovered_amount) as total_recovered_amount,
-    ROUND(
-        CASE 
-            WHEN SUM(c.denied_amount) > 0 
-            THEN (SUM(c.recovered_amount) / SUM(c.denied_amount)) * 100 
-            ELSE 0 
-        END, 2
+    COALESCE(
+        ROUND((SUM(c.recovered_amount) / NULLIF(SUM(c.denied_amount), 0)) * 100, 2),
+        0
     ) as recovery_percentage
 FROM claims c
 JOIN hospitals h ON c.hospital_id = h.hospital_id
 GROUP BY c.tenant_id, c.hospital_id, h.name;
 
+-- Recovery logs view with net recovery derived on read. Databases created
+-- before this change still carry the stored column, which would clash with
+-- the view's derived one.
+ALTER TABLE recovery_logs DROP COLUMN IF EXISTS net_recovery;
+
+CREATE OR REPLACE VIEW recovery_logs_summary AS
+SELECT 
+    r.*,
+    r.recovered_amount - r.processing_cost as net_recovery
+FROM recovery_logs r;
+
 -- Active denials view (for human review queue)
 CREATE OR REPLACE VIEW active_denials AS
 SELECT 